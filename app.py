@@ -1,27 +1,61 @@
-from flask import Flask, render_template, request
-from splitlogic import compute_balances, settle_debts
+import hashlib
+import threading
+
+import numpy as np
+from cachetools import TTLCache
+from flask import Flask, abort, make_response, render_template, request
+from splitlogic import compute_and_settle
 
 app = Flask(__name__)
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.jinja_env.auto_reload = False
+
+# Rendered result pages keyed by a digest of the submitted group
+RESULT_CACHE = TTLCache(maxsize=256, ttl=300)
+_result_cache_lock = threading.Lock()
 
 @app.route("/")
 def home():
-    return render_template("index.html")
+    # The form page never changes, so let browsers and proxies keep it
+    response = make_response(render_template("index.html"))
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    return response
 
 @app.route("/calculate", methods=["POST"])
 def calculate():
     names = request.form.getlist("name")
-    amounts = list(map(float, request.form.getlist("amount")))
+    if not names:
+        abort(400, "Add at least one person to split the bill.")
+    try:
+        amounts = np.fromiter(request.form.getlist("amount"), dtype=np.float64)
+    except ValueError:
+        abort(400, "Amounts must be numbers.")
+
+    # The page embeds the site URL in its share link, so that is part of the key too
+    key = hashlib.blake2b(repr((tuple(names), amounts.tobytes(), request.url_root)).encode(),
+                          digest_size=16).digest()
+    with _result_cache_lock:
+        html = RESULT_CACHE.get(key)
+    if html is not None:
+        return html
+
+    try:
+        total, share, balances, transactions = compute_and_settle(names, amounts)
+    except ValueError as e:
+        abort(400, str(e))
 
-    total, share, balances = compute_balances(names, amounts)
-    transactions = settle_debts(balances)
+    # Format every figure up front so the template just prints strings
+    rows = [(name, f"{amt:.2f}", f"{balances[name]:+.2f}") for name, amt in zip(names, amounts)]
+    payments = [(payer, receiver, f"{amt:.2f}") for payer, receiver, amt in transactions]
 
-    return render_template("result.html",
-                           names=names,
-                           amounts=amounts,
-                           total=total,
-                           share=share,
-                           balances=balances,
-                           transactions=transactions)
+    html = render_template("result.html",
+                           rows=rows,
+                           total=f"{total:.2f}",
+                           share=f"{share:.2f}",
+                           transactions=payments)
+    with _result_cache_lock:
+        RESULT_CACHE[key] = html
+    return html
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=False)
\ No newline at end of file
@@ -0,0 +1,26 @@
+# ============================================================================
+# AHEAD-OF-TIME BUILD OF THE SETTLEMENT KERNEL
+# ============================================================================
+# Compiles splitlogic's greedy settlement kernel into a native extension
+# module with Numba's pycc. The module is named after a hash of the kernel
+# source (settle_kernel_<hash>). When a build matching the current source is
+# present, splitlogic imports it instead of JIT-compiling the kernel on first
+# use. After editing the kernel, rebuild; stale builds are simply ignored.
+#
+# Usage: python build_kernel.py
+# ============================================================================
+
+import os
+
+from numba.pycc import CC
+
+from splitlogic import _kernel_module_name, _settle_impl
+
+cc = CC(_kernel_module_name())
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# (debtor_amts, creditor_amts) -> (debtor_idx, creditor_idx, amounts), all int64 paise
+cc.export("settle", "UniTuple(i8[:], 3)(i8[:], i8[:])")(_settle_impl)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -5,6 +5,28 @@
 # It calculates who owes money and who should receive money to settle debts.
 # ============================================================================
 
+import hashlib
+import importlib
+import inspect
+import threading
+from functools import lru_cache
+
+import numpy as np
+from numba import njit
+
+# Largest group settled with the exact zero-sum DP; bigger groups use greedy only
+_DP_MAX_PEOPLE = 16
+
+# Groups up to this size skip NumPy and settle with plain Python ints
+_SMALL_GROUP = 8
+
+# Largest amount accepted, in rupees; keeps every paise total well inside int64
+_MAX_AMOUNT = 1e12
+
+# Per-thread work buffers reused across calls; grown when a bigger group arrives
+_SCRATCH_SIZE = 1024
+_scratch = threading.local()
+
 def get_group_data():
     """
     Collect group data: number of people, their names, and amounts spent.
@@ -24,6 +46,7 @@ def get_group_data():
             print("    [ERROR] Please enter a valid integer.")
 
     names = []
+    names_seen = set()  # For O(1) duplicate checks
     amounts = []
 
     print("\n==> Enter each person's name and the amount they spent:")
@@ -35,11 +58,12 @@ def get_group_data():
                 print("    [ERROR] Name cannot be empty.")
                 continue
             # Check for duplicate names
-            if name in names:
+            if name in names_seen:
                 print(f"    [ERROR] '{name}' already entered. Please use a different name.")
                 continue
             break
         names.append(name)
+        names_seen.add(name)
 
         # Get amount spent by this person
         while True:
@@ -48,6 +72,9 @@ def get_group_data():
                 if amount < 0:
                     print("    [ERROR] Amount cannot be negative.")
                     continue
+                if not amount <= _MAX_AMOUNT:  # Also catches nan
+                    print(f"    [ERROR] Amount must be a number no larger than {_MAX_AMOUNT:,.0f}.")
+                    continue
                 break
             except ValueError:
                 print("    [ERROR] Please enter a valid number.")
@@ -55,6 +82,129 @@ def get_group_data():
 
     return names, amounts
 
+def _check_amounts(amounts):
+    """
+    Make sure every amount can be represented exactly in int64 paise.
+
+    Args:
+        amounts (ndarray): Amounts in rupees
+
+    Raises:
+        ValueError: If an amount is nan, infinite or larger than _MAX_AMOUNT
+    """
+    if not np.all(np.abs(amounts) <= _MAX_AMOUNT):  # Also catches nan
+        raise ValueError(f"Amounts must be numbers no larger than {_MAX_AMOUNT:,.0f}.")
+
+def _to_cents(amounts):
+    """
+    Convert amounts in rupees to integer paise.
+
+    Args:
+        amounts (list): Amounts in rupees
+
+    Returns:
+        list: Amounts in paise
+
+    Raises:
+        ValueError: If an amount is nan, infinite or too large
+    """
+    # For a handful of values NumPy call overhead outweighs the work; Python's
+    # round() rounds half to even just like np.rint, so both give the same paise
+    if len(amounts) <= _SMALL_GROUP and all(abs(amt) <= _MAX_AMOUNT for amt in amounts):
+        return [round(amt * 100) for amt in amounts]
+
+    amounts = np.asarray(amounts, dtype=np.float64)
+    _check_amounts(amounts)
+    return np.rint(amounts * 100).astype(np.int64).tolist()
+
+def _scratch_buffers(n):
+    """
+    Get this thread's reusable work buffers.
+
+    Args:
+        n (int): Number of entries needed
+
+    Returns:
+        tuple: (float64 view, int64 view), each of length n
+    """
+    floats = getattr(_scratch, "floats", None)
+    if floats is None or floats.size < n:
+        size = max(_SCRATCH_SIZE, 2 * n)
+        _scratch.floats = floats = np.empty(size, dtype=np.float64)
+        _scratch.ints = np.empty(size, dtype=np.int64)
+    return floats[:n], _scratch.ints[:n]
+
+def _balance_cents(cents, total_cents):
+    """
+    Turn each person's spending into their balance, in paise, in place.
+
+    The total rarely divides evenly, so the leftover paise are added to the
+    shares of the first few people. This keeps the balances summing to zero.
+
+    Args:
+        cents (ndarray): Amounts spent by each person, in paise
+        total_cents (int): Sum of all amounts, in paise
+
+    Returns:
+        ndarray: The same array, now holding balances in paise
+    """
+    share, extra = divmod(total_cents, len(cents))
+    cents -= share
+    cents[:extra] -= 1
+    return cents
+
+def _compute_cents(names, amounts):
+    """
+    Calculate total expense, per-person share, and balances in paise.
+
+    Args:
+        names (list): List of person names
+        amounts (list): List of amounts spent by each person
+
+    Returns:
+        tuple: (total_expense, equal_share, bal_cents)
+        - bal_cents: list of balances in paise
+
+    Raises:
+        ValueError: If names is empty or repeats a name, the number of amounts
+            differs from the number of names, or an amount is nan, infinite
+            or too large
+    """
+    n = len(names)
+    if n == 0:
+        raise ValueError("At least one person is needed to split a bill.")
+    if len(set(names)) != n:
+        raise ValueError("Each person needs a different name.")
+    if len(amounts) != n:
+        raise ValueError("Each person needs exactly one amount.")
+
+    if n <= _SMALL_GROUP:
+        # Plain ints beat NumPy for a handful of people; same split as _balance_cents
+        cents = _to_cents(amounts)
+        total_cents = sum(cents)
+        share, extra = divmod(total_cents, n)
+        bal_cents = [amt - share - (i < extra) for i, amt in enumerate(cents)]
+        return total_cents / 100, total_cents / 100 / n, bal_cents
+
+    amounts = np.asarray(amounts, dtype=np.float64)
+    _check_amounts(amounts)
+
+    # Work in integer paise so balances are exact and always sum to zero,
+    # using this thread's scratch buffers rather than fresh arrays
+    work, cents = _scratch_buffers(n)
+    np.multiply(amounts, 100, out=work)
+    np.rint(work, out=work)
+    np.copyto(cents, work, casting="unsafe")
+    total_cents = int(cents.sum())
+    total_expense = total_cents / 100
+    equal_share = total_expense / n
+
+    # balance = amount_paid - equal_share
+    bal_cents = _balance_cents(cents, total_cents)
+
+    # Copy out so no caller ever holds a view of the scratch buffer
+    return total_expense, equal_share, bal_cents.tolist()
+
 def compute_balances(names, amounts):
     """
     Calculate total expense, per-person share, and individual balances.
@@ -67,73 +217,405 @@ def compute_balances(names, amounts):
         tuple: (total_expense, equal_share, balances_dict)
         - balance > 0: person should receive money
         - balance < 0: person should pay money
-    """
-    total_expense = sum(amounts)
-    n = len(names)
-    equal_share = total_expense / n if n > 0 else 0.0
 
-    # Calculate balance for each person
-    # balance = amount_paid - equal_share
-    balances = {}
-    for name, amt in zip(names, amounts):
-        balances[name] = round(amt - equal_share, 2)
+    Raises:
+        ValueError: If names is empty or repeats a name, the number of amounts
+            differs from the number of names, or an amount is nan, infinite
+            or too large
+    """
+    total_expense, equal_share, bal_cents = _compute_cents(names, amounts)
+    balances = {name: cents / 100 for name, cents in zip(names, bal_cents)}
 
     return total_expense, equal_share, balances
 
+def _settle_impl(debtor_amts, creditor_amts):
+    """
+    Greedy two-pointer settlement kernel.
+
+    This is compiled ahead of time by build_kernel.py, or JIT-compiled with
+    Numba when the prebuilt module is missing; see _settle below. The amount
+    arrays are worked down in place, so callers must pass arrays they own.
+
+    Args:
+        debtor_amts (ndarray): Amounts owed in paise, sorted largest first
+        creditor_amts (ndarray): Amounts to receive in paise, sorted largest first
+
+    Returns:
+        tuple: (debtor_idx, creditor_idx, amounts) arrays, one entry per transaction
+    """
+    # A greedy settlement never needs more than (debtors + creditors - 1) payments
+    size = max(len(debtor_amts) + len(creditor_amts) - 1, 0)
+    debtor_idx = np.empty(size, dtype=np.int64)
+    creditor_idx = np.empty(size, dtype=np.int64)
+    amounts = np.empty(size, dtype=np.int64)
+
+    i, j, k = 0, 0, 0
+    while i < len(debtor_amts) and j < len(creditor_amts):
+        # Amount to settle in this transaction
+        amount = min(debtor_amts[i], creditor_amts[j])
+        debtor_idx[k] = i
+        creditor_idx[k] = j
+        amounts[k] = amount
+        k += 1
+
+        # Update remaining amounts
+        debtor_amts[i] -= amount
+        creditor_amts[j] -= amount
+
+        # Move to next debtor/creditor if fully settled
+        if debtor_amts[i] == 0:
+            i += 1
+        if creditor_amts[j] == 0:
+            j += 1
+
+    return debtor_idx[:k], creditor_idx[:k], amounts[:k]
+
+def _kernel_module_name():
+    """
+    Name of the prebuilt kernel module for the current _settle_impl source.
+
+    The name carries a hash of the kernel's source, so a build left over from
+    an older version of the kernel is never picked up.
+
+    Returns:
+        str: Module name, e.g. "settle_kernel_0123456789ab"
+    """
+    digest = hashlib.sha256(inspect.getsource(_settle_impl).encode()).hexdigest()
+    return f"settle_kernel_{digest[:12]}"
+
+# Prefer the ahead-of-time build so workers skip the JIT compile on first request
+try:
+    _settle = importlib.import_module(_kernel_module_name()).settle
+except (ImportError, OSError):  # No matching build, or no source to hash
+    _settle = njit(cache=True)(_settle_impl)
+
+def _zero_sum_groups(bal_cents):
+    """
+    Split balances into the largest number of groups that each sum to zero.
+
+    Each group of k people can be settled with k - 1 payments, so more
+    groups means fewer payments overall. Uses an O(n * 2^n) bitmask DP:
+    best[mask] is the most zero-sum groups the people in mask can form.
+
+    Args:
+        bal_cents (ndarray): Non-zero balances in paise
+
+    Returns:
+        list: List of index lists, one per zero-sum group
+    """
+    n = len(bal_cents)
+    size = 1 << n
+
+    # Subset sums and subset sizes for every bitmask
+    sums = np.zeros(size, dtype=np.int64)
+    popcount = np.zeros(size, dtype=np.int64)
+    for i in range(n):
+        bit = 1 << i
+        sums[bit:2 * bit] = sums[:bit] + bal_cents[i]
+        popcount[bit:2 * bit] = popcount[:bit] + 1
+    zero = (sums == 0).astype(np.int64)
+
+    # Fill the DP one subset size at a time, vectorized over each level
+    levels = np.argsort(popcount, kind="stable")
+    bounds = np.cumsum(np.bincount(popcount, minlength=n + 1))
+    best = np.zeros(size, dtype=np.int64)
+    for k in range(1, n + 1):
+        level = levels[bounds[k - 1]:bounds[k]]
+        cur = np.full(len(level), -1, dtype=np.int64)
+        for i in range(n):
+            bit = 1 << i
+            np.maximum(cur, np.where(level & bit, best[level ^ bit], -1), out=cur)
+        best[level] = cur + zero[level]
+
+    return _trace_groups(best, zero, n)
+
+def _trace_groups(best, zero, n):
+    """
+    Recover the zero-sum groups from a filled subset DP table.
+
+    Args:
+        best (sequence): Most zero-sum groups for each bitmask
+        zero (sequence): 1 where the bitmask sums to zero, else 0
+        n (int): Number of people
+
+    Returns:
+        list: List of index lists, one per zero-sum group
+    """
+    # Walk back from the full set; each zero-sum subset on the way closes a group
+    groups = []
+    mask = top = (1 << n) - 1
+    while mask:
+        target = best[mask] - zero[mask]
+        for i in range(n):
+            bit = 1 << i
+            if mask & bit and best[mask ^ bit] == target:
+                mask ^= bit
+                break
+        if zero[mask] or mask == 0:
+            groups.append([i for i in range(n) if (top ^ mask) >> i & 1])
+            top = mask
+
+    return groups
+
+def _greedy_settle(names, bal_cents):
+    """
+    Settle a set of balances by matching the largest debtor with the largest creditor.
+
+    Args:
+        names (list): Names of the people in this set
+        bal_cents (ndarray): Their balances in paise
+
+    Returns:
+        list: List of tuples (payer, receiver, amount)
+    """
+    # Separate creditors (positive balance) and debtors (negative balance) with sign masks
+    creditor_mask = bal_cents > 0
+    debtor_mask = bal_cents < 0
+    creditor_amts = bal_cents[creditor_mask]
+    debtor_amts = -bal_cents[debtor_mask]  # Store positive values
+    creditor_order = np.flatnonzero(creditor_mask)
+    debtor_order = np.flatnonzero(debtor_mask)
+
+    # Sort each side by amount (largest first) for greedy matching;
+    # a single creditor or debtor is already in order
+    if len(creditor_amts) > 1:
+        creditor_sort = np.argsort(-creditor_amts, kind="stable")
+        creditor_amts = creditor_amts[creditor_sort]
+        creditor_order = creditor_order[creditor_sort]
+    if len(debtor_amts) > 1:
+        debtor_sort = np.argsort(-debtor_amts, kind="stable")
+        debtor_amts = debtor_amts[debtor_sort]
+        debtor_order = debtor_order[debtor_sort]
+
+    # Masking and indexing yield fresh arrays, which the kernel can update in place
+    debtor_idx, creditor_idx, amounts = _settle(debtor_amts, creditor_amts)
+
+    # Map kernel indices back to names
+    debtor_order = debtor_order.tolist()
+    creditor_order = creditor_order.tolist()
+    return [(names[debtor_order[i]], names[creditor_order[j]], amt / 100)
+            for i, j, amt in zip(debtor_idx.tolist(), creditor_idx.tolist(), amounts.tolist())]
+
+def _subset_sums(values):
+    """
+    List the sums of every subset of values, starting with the empty subset.
+
+    Args:
+        values (list): Integers to combine
+
+    Returns:
+        list: 2^len(values) sums; index 0 is the empty subset
+    """
+    sums = [0]
+    for value in values:
+        sums += [total + value for total in sums]
+    return sums
+
+def _has_zero_subset(bal_cents):
+    """
+    Check whether some proper, non-empty subset of the balances sums to zero.
+
+    If none does, the whole group is the only zero-sum group and the subset
+    DP can be skipped. When the balances sum to zero, any such subset has a
+    complement that also sums to zero, so only subsets of all but the last
+    balance need to be tried. These are split into two halves, and the check
+    looks for a left-half sum that cancels a right-half sum (meet in the middle).
+
+    Args:
+        bal_cents (list): Non-zero balances in paise
+
+    Returns:
+        bool: True if such a subset exists
+    """
+    rest = bal_cents[:-1] if sum(bal_cents) == 0 else bal_cents
+    half = len(rest) // 2
+    left = set(_subset_sums(rest[:half])[1:])
+    right = {-total for total in _subset_sums(rest[half:])[1:]}
+    return 0 in left or 0 in right or not left.isdisjoint(right)
+
+def _zero_sum_groups_small(bal_cents):
+    """
+    Plain-Python version of _zero_sum_groups for small groups.
+
+    Args:
+        bal_cents (list): Non-zero balances in paise
+
+    Returns:
+        list: List of index lists, one per zero-sum group
+    """
+    n = len(bal_cents)
+    size = 1 << n
+    zero = [1] * size
+    sums = [0] * size
+    best = [0] * size
+    for mask in range(1, size):
+        low = mask & -mask
+        sums[mask] = sums[mask ^ low] + bal_cents[low.bit_length() - 1]
+        zero[mask] = int(sums[mask] == 0)
+        # Most groups after dropping any one person from this subset
+        most, rest = 0, mask
+        while rest:
+            bit = rest & -rest
+            if best[mask ^ bit] > most:
+                most = best[mask ^ bit]
+            rest ^= bit
+        best[mask] = most + zero[mask]
+
+    return _trace_groups(best, zero, n)
+
+def _settle_small(names, bal_cents, split):
+    """
+    Settle a small group with plain Python ints.
+
+    At this size NumPy call overhead outweighs the arithmetic, so everything
+    runs on lists. The result matches the general path.
+
+    Args:
+        names (list): Names of people with a non-zero balance
+        bal_cents (list): Their balances in paise
+        split (bool): Whether to split into zero-sum groups with the subset DP first
+
+    Returns:
+        list: List of tuples (payer, receiver, amount)
+    """
+    groups = _zero_sum_groups_small(bal_cents) if split else [range(len(bal_cents))]
+
+    transactions = []
+    for group in groups:
+        # Largest first, keeping input order among equal amounts
+        creditors = [i for i in group if bal_cents[i] > 0]
+        debtors = [i for i in group if bal_cents[i] < 0]
+        if len(creditors) > 1:
+            creditors.sort(key=bal_cents.__getitem__, reverse=True)
+        if len(debtors) > 1:
+            debtors.sort(key=bal_cents.__getitem__)
+        credits = [bal_cents[i] for i in creditors]
+        debts = [-bal_cents[i] for i in debtors]
+
+        i, j = 0, 0
+        while i < len(debts) and j < len(credits):
+            amount = min(debts[i], credits[j])
+            transactions.append((names[debtors[i]], names[creditors[j]], amount / 100))
+            debts[i] -= amount
+            credits[j] -= amount
+            if debts[i] == 0:
+                i += 1
+            if credits[j] == 0:
+                j += 1
+
+    return transactions
+
 def settle_debts(balances):
     """
-    Generate settlement transactions using a greedy algorithm.
-    
-    This algorithm minimizes the number of transactions by repeatedly
-    matching the largest debtor with the largest creditor.
+    Generate the minimum number of settlement transactions.
+
+    For groups of up to _DP_MAX_PEOPLE people with non-zero balances, the
+    balances are first split into as many zero-sum groups as possible, which
+    gives the true minimum. Each group is then settled with the greedy
+    algorithm. Larger groups use the greedy algorithm directly.
     
     Args:
         balances (dict): Dictionary mapping names to their balance
     
     Returns:
         list: List of tuples (payer, receiver, amount)
+
+    Raises:
+        ValueError: If a balance is nan, infinite or too large
     """
-    # Separate creditors (positive balance) and debtors (negative balance)
-    creditors = []  # [name, amount to receive]
-    debtors = []    # [name, amount to pay]
+    return _settle_paise(list(balances), _to_cents(list(balances.values())))
 
-    for name, bal in balances.items():
-        if bal > 0.01:  # Use small threshold to avoid floating point issues
-            creditors.append([name, bal])
-        elif bal < -0.01:
-            debtors.append([name, -bal])  # Store positive value
+def _settle_paise(names, bal_cents):
+    """
+    Settle balances in paise, memoizing all but small groups.
 
-    # Sort by amount (largest first) for greedy matching
-    creditors.sort(key=lambda x: x[1], reverse=True)
-    debtors.sort(key=lambda x: x[1], reverse=True)
+    Args:
+        names (list): List of person names
+        bal_cents (list): Their balances in paise
 
-    transactions = []
-    i, j = 0, 0
-    while i < len(debtors) and j < len(creditors):
-        debtor_name, debtor_owes = debtors[i]
-        creditor_name, creditor_receives = creditors[j]
+    Returns:
+        list: List of tuples (payer, receiver, amount)
+    """
+    if len(names) <= _SMALL_GROUP:
+        # Settling a handful of people costs about as much as the cache lookup
+        return _settle_balances(names, bal_cents)
 
-        # Amount to settle in this transaction
-        amount = round(min(debtor_owes, creditor_receives), 2)
+    # Sorting gives the same cache key for any input order
+    return list(_settle_cents(tuple(sorted(zip(names, bal_cents)))))
 
-        if amount > 0:
-            transactions.append((debtor_name, creditor_name, amount))
+@lru_cache(maxsize=1024)
+def _settle_cents(balances_items):
+    """
+    Cached settlement over a hashable balance signature.
 
-        # Update remaining amounts
-        debtor_owes = round(debtor_owes - amount, 2)
-        creditor_receives = round(creditor_receives - amount, 2)
+    Args:
+        balances_items (tuple): Sorted tuple of (name, balance in paise) pairs
 
-        debtors[i][1] = debtor_owes
-        creditors[j][1] = creditor_receives
+    Returns:
+        tuple: Tuple of (payer, receiver, amount) transactions
+    """
+    names = [name for name, _ in balances_items]
+    bal_cents = [cents for _, cents in balances_items]
+    return tuple(_settle_balances(names, bal_cents))
 
-        # Move to next debtor/creditor if fully settled
-        if debtor_owes < 0.01:
-            i += 1
-        if creditor_receives < 0.01:
-            j += 1
+def _settle_balances(names, bal_cents):
+    """
+    Settle balances in paise, without caching.
 
+    Args:
+        names (list): List of person names
+        bal_cents (list): Their balances in paise
+
+    Returns:
+        list: List of tuples (payer, receiver, amount)
+    """
+    # Skip people who are already even
+    if 0 in bal_cents:
+        names = [name for name, cents in zip(names, bal_cents) if cents != 0]
+        bal_cents = [cents for cents in bal_cents if cents != 0]
+
+    # The subset DP only pays off when some proper subset sums to zero,
+    # which needs at least four people
+    n = len(names)
+    split = 3 < n <= _DP_MAX_PEOPLE and _has_zero_subset(bal_cents)
+
+    if n <= _SMALL_GROUP:
+        return _settle_small(names, bal_cents, split)
+
+    if not split:
+        return _greedy_settle(names, np.array(bal_cents, dtype=np.int64))
+
+    bal_cents = np.array(bal_cents, dtype=np.int64)
+    transactions = []
+    for group in _zero_sum_groups(bal_cents):
+        transactions.extend(_greedy_settle([names[i] for i in group], bal_cents[group]))
     return transactions
 
+def compute_and_settle(names, amounts):
+    """
+    Calculate balances and settlement transactions in a single pass.
+
+    The balances in paise are computed once and fed straight into the
+    settlement step, skipping the rupee round trip through settle_debts.
+
+    Args:
+        names (list): List of person names
+        amounts (list): List of amounts spent by each person
+
+    Returns:
+        tuple: (total_expense, equal_share, balances_dict, transactions)
+
+    Raises:
+        ValueError: If names is empty or repeats a name, the number of amounts
+            differs from the number of names, or an amount is nan, infinite
+            or too large
+    """
+    total_expense, equal_share, bal_cents = _compute_cents(names, amounts)
+    balances = {name: cents / 100 for name, cents in zip(names, bal_cents)}
+    transactions = _settle_paise(names, bal_cents)
+
+    return total_expense, equal_share, balances, transactions
+
 def print_summary(names, amounts, total_expense, equal_share, balances, transactions):
     """
     Print a comprehensive summary of expenses and settlements.
@@ -165,8 +647,7 @@ def print_summary(names, amounts, total_expense, equal_share, balances, transact
     print("\n[BALANCE SHEET]")
     print(f"  {'Name':20s} {'Amount Paid':>15s} {'Equal Share':>15s} {'Balance':>15s}")
     print("  " + "-"*65)
-    for name in names:
-        amt = next(a for n, a in zip(names, amounts) if n == name)
+    for name, amt in zip(names, amounts):
         bal = balances[name]
         status = "(Receives)" if bal > 0 else "(Pays)" if bal < 0 else "(Even)"
         print(f"  {name:20s} {amt:15.2f} {equal_share:15.2f} {bal:+10.2f} {status}")
@@ -193,13 +674,10 @@ def main():
     # Step 1: Collect group data
     names, amounts = get_group_data()
 
-    # Step 2: Calculate balances
-    total_expense, equal_share, balances = compute_balances(names, amounts)
-
-    # Step 3: Determine settlement transactions
-    transactions = settle_debts(balances)
+    # Step 2: Calculate balances and settlement transactions
+    total_expense, equal_share, balances, transactions = compute_and_settle(names, amounts)
 
-    # Step 4: Display summary
+    # Step 3: Display summary
     print_summary(names, amounts, total_expense, equal_share, balances, transactions)
 
 
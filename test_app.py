@@ -0,0 +1,31 @@
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def post(client, names, amounts):
+    return client.post("/calculate", data={"name": names, "amount": amounts})
+
+
+def test_calculate_renders_settlement(client):
+    response = post(client, ["a", "b"], ["30", "10"])
+    assert response.status_code == 200
+    assert "<strong>b</strong> pays <strong>a</strong> ₹10.00" in response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize("bad", ["nan", "1e400", "1e17", "abc"])
+def test_calculate_rejects_invalid_amounts(client, bad):
+    assert post(client, ["a", "b"], [bad, "0"]).status_code == 400
+
+
+def test_calculate_rejects_duplicate_names(client):
+    assert post(client, ["Ann", "Ann", "Bob"], ["30", "0", "0"]).status_code == 400
+
+
+def test_calculate_rejects_amount_count_mismatch(client):
+    assert post(client, ["a", "b", "c"], ["30"]).status_code == 400
@@ -0,0 +1,133 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+import splitlogic
+from splitlogic import compute_and_settle, compute_balances, settle_debts
+
+
+@pytest.mark.parametrize("bad", [math.nan, math.inf, -math.inf, 1e17])
+def test_rejects_amounts_that_do_not_fit_in_paise(bad):
+    with pytest.raises(ValueError):
+        compute_and_settle(["a", "b"], [bad, 0.0])
+    with pytest.raises(ValueError):
+        compute_balances(["a", "b"], [bad, 0.0])
+    with pytest.raises(ValueError):
+        settle_debts({"a": bad, "b": 0.0})
+
+
+def brute_force_min_transactions(balances):
+    """Fewest payments that settle balances, by exhaustive search."""
+    debts = [b for b in balances if b != 0]
+
+    def search(start):
+        while start < len(debts) and debts[start] == 0:
+            start += 1
+        if start == len(debts):
+            return 0
+        best = math.inf
+        tried = set()
+        for j in range(start + 1, len(debts)):
+            if debts[j] * debts[start] < 0 and debts[j] not in tried:
+                tried.add(debts[j])
+                debts[j] += debts[start]
+                best = min(best, 1 + search(start + 1))
+                debts[j] -= debts[start]
+                if debts[j] + debts[start] == 0:
+                    break  # An exact match can't be beaten
+        return best
+
+    return search(0)
+
+
+def random_balances(rng, n, spread):
+    """n non-zero balances in paise that sum to zero."""
+    while True:
+        bal = [rng.choice([-1, 1]) * rng.randint(1, spread) for _ in range(n - 1)]
+        bal.append(-sum(bal))
+        if bal[-1] != 0:
+            return bal
+
+
+def assert_settles(balances, transactions):
+    net = dict.fromkeys(balances, 0)
+    for payer, receiver, amount in transactions:
+        assert amount > 0
+        net[payer] -= round(amount * 100)
+        net[receiver] += round(amount * 100)
+    assert net == {name: round(bal * 100) for name, bal in balances.items()}
+
+
+def test_transaction_count_matches_brute_force_minimum():
+    rng = random.Random(4)
+    for _ in range(300):
+        n = rng.randint(2, 10)
+        bal = random_balances(rng, n, rng.choice([3, 9, 500]))
+        balances = {f"p{i}": c / 100 for i, c in enumerate(bal)}
+        assert len(settle_debts(balances)) == brute_force_min_transactions(bal)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 8, 9, 16, 17, 40])
+def test_transactions_settle_every_balance(n):
+    rng = random.Random(n)
+    for _ in range(50):
+        names = [f"p{i}" for i in range(n)]
+        amounts = [round(rng.uniform(0, 500), 2) for _ in names]
+        total, share, balances, transactions = compute_and_settle(names, amounts)
+        assert sum(round(b * 100) for b in balances.values()) == 0
+        assert_settles(balances, transactions)
+        assert len(transactions) <= n - 1
+
+
+def test_small_path_matches_numpy_path():
+    rng = random.Random(13)
+    for _ in range(500):
+        n = rng.randint(1, splitlogic._SMALL_GROUP)
+        bal = random_balances(rng, n, rng.choice([5, 3000])) if n > 1 else []
+        names = [f"p{i}" for i in range(len(bal))]
+        bal_arr = np.array(bal, dtype=np.int64)
+        expected = []
+        for group in splitlogic._zero_sum_groups(bal_arr):
+            expected += splitlogic._greedy_settle([names[i] for i in group], bal_arr[group])
+        split = len(bal) > 3 and splitlogic._has_zero_subset(bal)
+        assert splitlogic._settle_small(names, bal, split) == expected
+
+
+def test_rejects_duplicate_names():
+    with pytest.raises(ValueError):
+        compute_and_settle(["Ann", "Ann", "Bob"], [30.0, 0.0, 0.0])
+    with pytest.raises(ValueError):
+        compute_balances(["Ann", "Ann", "Bob"], [30.0, 0.0, 0.0])
+
+
+@pytest.mark.parametrize("n", [3, splitlogic._SMALL_GROUP + 2])
+def test_rejects_amount_count_mismatch(n):
+    names = [f"p{i}" for i in range(n)]
+    with pytest.raises(ValueError):
+        compute_and_settle(names, [30.0])
+    with pytest.raises(ValueError):
+        compute_and_settle(names, [1.0] * (n + 1))
+
+
+def test_groups_without_zero_sum_subset_skip_the_dp(monkeypatch):
+    rng = random.Random(21)
+    cases = []
+    while len(cases) < 40:
+        n = rng.randint(splitlogic._SMALL_GROUP + 1, splitlogic._DP_MAX_PEOPLE)
+        bal = random_balances(rng, n, 500000)
+        bal_arr = np.array(bal, dtype=np.int64)
+        groups = splitlogic._zero_sum_groups(bal_arr)
+        if len(groups) == 1:
+            # What the DP branch produces for a single zero-sum group
+            names = [f"p{i}" for i in range(n)]
+            expected = splitlogic._greedy_settle([names[i] for i in groups[0]], bal_arr[groups[0]])
+            cases.append((tuple(zip(names, bal)), tuple(expected)))
+
+    def fail(bal_cents):
+        raise AssertionError("subset DP should have been skipped")
+
+    monkeypatch.setattr(splitlogic, "_zero_sum_groups", fail)
+    for items, expected in cases:
+        assert splitlogic._settle_cents.__wrapped__(items) == expected